@@ -0,0 +1,58 @@
+"""
+Small on-disk JSON cache shared by sync runs.
+
+Entries live under $XDG_CACHE_HOME/exist-rize (~/.cache/exist-rize by
+default). The cache is best-effort: unreadable entries count as missing and
+failed writes are ignored, so a broken cache never breaks a sync.
+"""
+import json
+import os
+from pathlib import Path
+
+
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or "~/.cache").expanduser() / "exist-rize"
+
+
+def _path(name: str) -> Path:
+    return CACHE_DIR / f"{name}.json"
+
+
+def load(name: str):
+    """Return the cached value stored under `name`, or None if there is none."""
+    try:
+        with open(_path(name)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def store(name: str, value):
+    """Cache a JSON-serializable value under `name`, replacing it atomically."""
+    path = _path(name)
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump(value, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def remove(name: str):
+    """Drop the cached value stored under `name`, if any."""
+    try:
+        _path(name).unlink()
+    except OSError:
+        pass
+
+
+def names() -> list:
+    """List the names of all cached values."""
+    try:
+        return [path.stem for path in CACHE_DIR.glob("*.json")]
+    except OSError:
+        return []
@@ -1,12 +1,38 @@
 """
 Exist.io REST API client for writing custom attributes.
 """
+import logging
 import os
+import re
+import shutil
+import threading
+import time
+from datetime import date, timedelta
+
 import requests
-from datetime import date
 
+from http_utils import REQUEST_TIMEOUT, create_session, json_dumps, json_loads
+
+logger = logging.getLogger(__name__)
 
 EXIST_API_URL = "https://exist.io/api/2"
+EXIST_TOKEN_URL = "https://exist.io/oauth2/access_token"
+
+# Most requests expected in flight at once (background lookups plus the
+# update); the session keeps that many keep-alive connections to exist.io
+MAX_CONCURRENT_REQUESTS = 8
+
+# How long attribute listings are reused before being fetched again (seconds)
+ATTRIBUTE_CACHE_TTL = 60
+
+# Per-request limits of the Exist API: updates per attributes/update/ call
+# and days per attributes/with-values/ query
+MAX_UPDATES_PER_REQUEST = 35
+MAX_VALUE_DAYS = 31
+
+# Token lines rewritten in .env after a refresh
+_ACCESS_TOKEN_LINE = re.compile(r"^EXIST_ACCESS_TOKEN=.*$", re.MULTILINE)
+_REFRESH_TOKEN_LINE = re.compile(r"^EXIST_REFRESH_TOKEN=.*$", re.MULTILINE)
 
 # Value type codes for Exist API
 VALUE_TYPES = {
@@ -32,50 +58,107 @@ class ExistClient:
         self.client_id = client_id
         self.client_secret = client_secret
 
-    def _headers(self) -> dict:
-        return {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json",
-        }
+        self._refresh_lock = threading.Lock()
+
+        # endpoint -> (fetched_at, response) for memoized attribute listings
+        self._attribute_cache = {}
+
+        # One pooled session for every call, so keep-alive connections are
+        # reused instead of paying a fresh TLS handshake per request. It's
+        # only created on first use, as runs served from local caches never
+        # talk to Exist at all.
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    def _get_session(self):
+        """Return the client's HTTP session, creating it on first use."""
+        with self._session_lock:
+            if self._session is None:
+                self._session = create_session(pool_connections=1,
+                                               pool_maxsize=MAX_CONCURRENT_REQUESTS)
+                self._session.headers.update({
+                    "Authorization": f"Bearer {self.access_token}",
+                    "Content-Type": "application/json",
+                })
+            return self._session
+
+    def close(self):
+        """Close the underlying HTTP session and its pooled connections."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _request(self, method: str, endpoint: str, **kwargs) -> dict:
         """Make an API request, handling token refresh if needed."""
         url = f"{EXIST_API_URL}/{endpoint}"
-        response = requests.request(method, url, headers=self._headers(), **kwargs)
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+        if "json" in kwargs:
+            kwargs["data"] = json_dumps(kwargs.pop("json"))
+        session = self._get_session()
+        token = self.access_token
+        response = session.request(method, url, **kwargs)
 
-        # If unauthorized and we have refresh credentials, try refresh
+        # Other transient errors are retried by the session's adapter; an
+        # expired token is the one case handled here, by refreshing it
         if response.status_code == 401 and self.refresh_token:
-            if self._refresh_access_token():
-                response = requests.request(method, url, headers=self._headers(), **kwargs)
+            if self._refresh_access_token(expired_token=token):
+                response = session.request(method, url, **kwargs)
 
         response.raise_for_status()
-        return response.json() if response.text else {}
+        return json_loads(response.content) if response.content else {}
 
-    def _refresh_access_token(self) -> bool:
-        """Refresh the access token using the refresh token."""
-        if not all([self.refresh_token, self.client_id, self.client_secret]):
-            return False
+    def _refresh_access_token(self, expired_token: str = None) -> bool:
+        """
+        Refresh the access token using the refresh token.
 
-        response = requests.post(
-            "https://exist.io/oauth2/access_token",
-            data={
-                "grant_type": "refresh_token",
-                "refresh_token": self.refresh_token,
-                "client_id": self.client_id,
-                "client_secret": self.client_secret,
-            },
-        )
-
-        if response.status_code == 200:
-            data = response.json()
-            self.access_token = data["access_token"]
-            self.refresh_token = data.get("refresh_token", self.refresh_token)
-            self._save_new_tokens()
-            print("Access token refreshed successfully")
-            return True
-
-        print(f"Failed to refresh token: {response.text}")
-        return False
+        Requests can run on several threads at once, so refreshes are
+        serialized. If `expired_token` is given and another thread has
+        already replaced it, that thread's new token is reused instead of
+        refreshing again (which would also burn the rotated refresh token).
+        """
+        with self._refresh_lock:
+            if expired_token is not None and self.access_token != expired_token:
+                return True
+
+            if not all([self.refresh_token, self.client_id, self.client_secret]):
+                return False
+
+            # Sent outside the retrying session: Exist may already have rotated
+            # the refresh token when a response is lost, and resending the spent
+            # one would fail and force a manual re-authorization
+            response = requests.post(
+                EXIST_TOKEN_URL,
+                data={
+                    "grant_type": "refresh_token",
+                    "refresh_token": self.refresh_token,
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                },
+                timeout=REQUEST_TIMEOUT,
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                self.access_token = data["access_token"]
+                self.refresh_token = data.get("refresh_token", self.refresh_token)
+                # A session created later picks up the new token itself, so
+                # only an open one needs updating (and none is reopened here)
+                with self._session_lock:
+                    if self._session is not None:
+                        self._session.headers["Authorization"] = f"Bearer {self.access_token}"
+                self._save_new_tokens()
+                logger.info("Access token refreshed successfully")
+                return True
+
+            logger.error("Failed to refresh token: %s", response.text)
+            return False
 
     def _save_new_tokens(self):
         """Update the .env file with new tokens."""
@@ -84,23 +167,58 @@ class ExistClient:
             return
 
         with open(env_path, "r") as f:
-            lines = f.readlines()
+            text = f.read()
+
+        text = _ACCESS_TOKEN_LINE.sub(
+            lambda _: f"EXIST_ACCESS_TOKEN={self.access_token}", text)
+        text = _REFRESH_TOKEN_LINE.sub(
+            lambda _: f"EXIST_REFRESH_TOKEN={self.refresh_token}", text)
 
-        new_lines = []
-        for line in lines:
-            if line.startswith("EXIST_ACCESS_TOKEN="):
-                new_lines.append(f"EXIST_ACCESS_TOKEN={self.access_token}\n")
-            elif line.startswith("EXIST_REFRESH_TOKEN="):
-                new_lines.append(f"EXIST_REFRESH_TOKEN={self.refresh_token}\n")
-            else:
-                new_lines.append(line)
+        # Write to a temp file and swap it in, so a crash never leaves a
+        # half-written .env behind. The temp file starts out private and
+        # only gets .env's own permissions once the tokens are in it.
+        tmp_path = env_path + ".tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            shutil.copymode(env_path, tmp_path)
+            os.replace(tmp_path, env_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
 
-        with open(env_path, "w") as f:
-            f.writelines(new_lines)
+    def _cached_get(self, endpoint: str):
+        """GET an attribute listing, reusing a recent response if there is one."""
+        cached = self._attribute_cache.get(endpoint)
+        if cached is not None and time.monotonic() - cached[0] < ATTRIBUTE_CACHE_TTL:
+            return cached[1]
+
+        result = self._get_all_pages(endpoint)
+        self._attribute_cache[endpoint] = (time.monotonic(), result)
+        return result
+
+    def _get_all_pages(self, endpoint: str) -> list:
+        """GET every page of a paged listing and return the combined results."""
+        results = []
+        params = {"limit": 100, "page": 1}
+        while True:
+            data = self._request("GET", endpoint, params=params)
+            results.extend(data.get("results", []))
+            if not data.get("next"):
+                return results
+            params["page"] += 1
+
+    def invalidate_attribute_cache(self):
+        """Forget memoized attribute listings after ownership changes."""
+        self._attribute_cache.clear()
 
     def get_owned_attributes(self) -> list:
         """Get list of attributes owned by this client."""
-        return self._request("GET", "attributes/owned/")
+        return self._cached_get("attributes/owned/")
 
     def create_attribute(self, label: str, value_type: str = "duration",
                          group: str = "custom") -> dict:
@@ -115,16 +233,31 @@ class ExistClient:
         Returns:
             The created attribute data including the generated 'name' (slug)
         """
-        # Convert string value_type to integer code
-        vtype_code = VALUE_TYPES.get(value_type.lower(), 3)  # default to duration
-
-        payload = [{
-            "label": label,
-            "value_type": vtype_code,
-            "group": group,
-            "manual": False,
-        }]
+        return self.create_attributes([(label, value_type, group)])
+
+    def create_attributes(self, attributes: list) -> dict:
+        """
+        Create several custom attributes in a single request.
+
+        Args:
+            attributes: List of (label, value_type, group) tuples, as for
+                create_attribute()
+
+        Returns:
+            dict with 'success' and 'failed' lists, one entry per attribute
+        """
+        payload = [
+            {
+                "label": label,
+                # Convert string value_type to integer code
+                "value_type": VALUE_TYPES.get(value_type.lower(), 3),  # default to duration
+                "group": group,
+                "manual": False,
+            }
+            for label, value_type, group in attributes
+        ]
         result = self._request("POST", "attributes/create/", json=payload)
+        self.invalidate_attribute_cache()
         return result
 
     def acquire_attribute(self, attribute_name: str) -> dict:
@@ -134,13 +267,25 @@ class ExistClient:
         Args:
             attribute_name: The attribute slug (e.g., "rize_focus_time")
         """
-        payload = [{"name": attribute_name, "active": True}]
-        return self._request("POST", "attributes/acquire/", json=payload)
+        return self.acquire_attributes([attribute_name])
+
+    def acquire_attributes(self, attribute_names: list) -> dict:
+        """Acquire ownership of several attributes in a single request."""
+        payload = [{"name": name, "active": True} for name in attribute_names]
+        result = self._request("POST", "attributes/acquire/", json=payload)
+        self.invalidate_attribute_cache()
+        return result
 
     def release_attribute(self, attribute_name: str) -> dict:
         """Release ownership of an attribute."""
-        payload = [{"name": attribute_name}]
-        return self._request("POST", "attributes/release/", json=payload)
+        return self.release_attributes([attribute_name])
+
+    def release_attributes(self, attribute_names: list) -> dict:
+        """Release ownership of several attributes in a single request."""
+        payload = [{"name": name} for name in attribute_names]
+        result = self._request("POST", "attributes/release/", json=payload)
+        self.invalidate_attribute_cache()
+        return result
 
     def update_attribute(self, attribute_name: str, target_date: date, value: int) -> dict:
         """
@@ -151,13 +296,81 @@ class ExistClient:
             target_date: The date to update
             value: The value (for duration type, this is in minutes)
         """
-        payload = [{
-            "name": attribute_name,
-            "date": target_date.isoformat(),
-            "value": value,
-        }]
-        return self._request("POST", "attributes/update/", json=payload)
+        return self.update_attributes([(attribute_name, target_date, value)])
+
+    def update_attributes(self, updates: list) -> dict:
+        """
+        Update several attribute values, batching them into as few
+        requests as Exist allows.
+
+        Args:
+            updates: List of (attribute_name, target_date, value) tuples
+
+        Returns:
+            dict with 'success' and 'failed' lists, one entry per update. If
+            a request fails outright, each of its updates is listed as
+            failed with that error, and the remaining requests still go out.
+        """
+        payload = [
+            {"name": name, "date": target_date.isoformat(), "value": value}
+            for name, target_date, value in updates
+        ]
+
+        # Exist takes at most MAX_UPDATES_PER_REQUEST updates per request
+        result = {"success": [], "failed": []}
+        for i in range(0, len(payload), MAX_UPDATES_PER_REQUEST):
+            chunk = payload[i:i + MAX_UPDATES_PER_REQUEST]
+            try:
+                response = self._request("POST", "attributes/update/", json=chunk)
+            except Exception as e:
+                result["failed"].extend({**update, "error": str(e)} for update in chunk)
+                continue
+            result["success"].extend(response.get("success", []))
+            result["failed"].extend(response.get("failed", []))
+        return result
+
+    def get_attribute_values(self, attribute_names: list, date_max: date,
+                             days: int = 1) -> dict:
+        """
+        Get the current values of attributes for a range of days.
+
+        Args:
+            attribute_names: Attribute slugs to look up
+            date_max: The most recent date to include
+            days: How many days back from date_max to include
+
+        Returns:
+            dict mapping (attribute_name, date) to the stored value
+        """
+        values = {}
+
+        # Exist returns at most MAX_VALUE_DAYS days per query, so walk back
+        # from date_max one window at a time
+        while days > 0:
+            window = min(days, MAX_VALUE_DAYS)
+            params = {
+                "attributes": ",".join(attribute_names),
+                "date_max": date_max.isoformat(),
+                "days": window,
+                "limit": 100,
+                "page": 1,
+            }
+
+            while True:
+                data = self._request("GET", "attributes/with-values/", params=params)
+                for attr in data.get("results", []):
+                    for entry in attr.get("values", []):
+                        key = (attr["name"], date.fromisoformat(entry["date"]))
+                        values[key] = entry["value"]
+                if not data.get("next"):
+                    break
+                params["page"] += 1
+
+            date_max -= timedelta(days=window)
+            days -= window
+
+        return values
 
     def get_user_attributes(self) -> list:
         """Get all attributes for the current user."""
-        return self._request("GET", "attributes/")
+        return self._cached_get("attributes/")
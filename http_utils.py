@@ -0,0 +1,80 @@
+"""
+Shared HTTP plumbing for the Rize and Exist API clients.
+"""
+import json
+import random
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib json module is the fallback
+    orjson = None
+
+
+# (connect, read) timeouts in seconds
+REQUEST_TIMEOUT = (5, 30)
+
+# Upper bound and random spread added to each retry backoff (seconds)
+BACKOFF_MAX = 60
+BACKOFF_JITTER = 0.5
+
+
+class JitteredRetry(Retry):
+    """
+    Retry policy whose exponential backoff is capped and jittered.
+
+    The jitter keeps several clients (or threads) that were rate limited
+    together from all retrying at the same moment. A Retry-After header,
+    when present, still takes precedence over the computed backoff.
+    """
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return 0
+        return min(BACKOFF_MAX, backoff) + random.uniform(0, BACKOFF_JITTER)
+
+
+# Transient failures (rate limiting, server and gateway errors) are retried
+# by urllib3. Once retries run out the last response is returned so
+# raise_for_status() reports it. POST is included because the writes sent
+# through these sessions are safe to repeat: updates set a date's full value,
+# Rize queries only read, and creating or acquiring an attribute twice just
+# fails for the duplicate. Calls that aren't, like the OAuth token refresh,
+# must not go through a session created here.
+RETRY_POLICY = JitteredRetry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET", "POST", "PUT"],
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+
+def create_session(pool_connections: int, pool_maxsize: int) -> requests.Session:
+    """Create a keep-alive session with RETRY_POLICY mounted for HTTPS."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=RETRY_POLICY,
+    ))
+    return session
+
+
+def json_dumps(obj) -> bytes:
+    """Encode a request body, using orjson when it's installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def json_loads(raw: bytes):
+    """Decode a response body, using orjson when it's installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
@@ -1,212 +1,167 @@
 """
 Rize GraphQL API client for fetching time tracking data.
 """
-import requests
-from datetime import date, datetime, timezone
+from datetime import date, datetime, time, timezone
+
+from http_utils import REQUEST_TIMEOUT, create_session, json_dumps, json_loads
 
 
 RIZE_API_URL = "https://api.rize.io/api/v1/graphql"
 
+# Most queries worth running against Rize at once; the session keeps one
+# keep-alive connection per concurrent query so none are torn down
+MAX_CONCURRENT_REQUESTS = 4
+
+# Shared session so consecutive GraphQL queries reuse one keep-alive connection
+_SESSION = create_session(pool_connections=2, pool_maxsize=MAX_CONCURRENT_REQUESTS)
+_SESSION.headers.update({"Content-Type": "application/json"})
+
+
+# GraphQL query for a day's categories and sessions, taking the day's
+# $startTime/$endTime range
+_Q_ALL = """
+query DailyData($startTime: ISO8601DateTime!, $endTime: ISO8601DateTime!) {
+    categories(startTime: $startTime, endTime: $endTime) {
+        category {
+            key
+            focus
+        }
+        timeSpent
+    }
+    sessions(startTime: $startTime, endTime: $endTime) {
+        type
+        startTime
+        endTime
+    }
+}
+"""
+
 
 def _make_request(api_key: str, query: str, variables: dict) -> dict:
     """Make a GraphQL request to the Rize API."""
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}",
-    }
+    headers = {"Authorization": f"Bearer {api_key}"}
 
     payload = {"query": query, "variables": variables}
-    response = requests.post(RIZE_API_URL, headers=headers, json=payload)
+    response = _SESSION.post(RIZE_API_URL, headers=headers, data=json_dumps(payload),
+                             timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
 
-    data = response.json()
+    data = json_loads(response.content)
     if "errors" in data:
         raise RuntimeError(f"Rize API error: {data['errors']}")
 
     return data["data"]
 
 
-def get_category_breakdown(api_key: str, target_date: date) -> dict:
-    """
-    Fetch time spent per category with focus flags for a specific date.
+def _day_range(target_date: date) -> dict:
+    """Build the UTC $startTime/$endTime query variables covering a day."""
+    return {
+        "startTime": datetime.combine(target_date, time.min, tzinfo=timezone.utc).isoformat(),
+        "endTime": datetime.combine(target_date, time.max, tzinfo=timezone.utc).isoformat(),
+    }
 
-    Args:
-        api_key: Rize API key
-        target_date: The date to fetch data for
+
+def _parse_iso(value: str):
+    """
+    Parse an ISO 8601 timestamp from Rize, assuming UTC if it has no offset.
 
     Returns:
-        dict with category times and computed totals
+        Timezone-aware datetime, or None if the value can't be parsed
     """
-    start = datetime.combine(target_date, datetime.min.time()).isoformat() + "Z"
-    end = datetime.combine(target_date, datetime.max.time()).isoformat() + "Z"
-
-    query = """
-    query CategoryTimes($startTime: ISO8601DateTime!, $endTime: ISO8601DateTime!) {
-        categories(startTime: $startTime, endTime: $endTime) {
-            category {
-                key
-                name
-                focus
-            }
-            timeSpent
-        }
-    }
+    if not value:
+        return None
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _summarize_categories(categories: list) -> dict:
     """
+    Aggregate a `categories` response into per-category times and totals.
 
-    data = _make_request(api_key, query, {
-        "startTime": start,
-        "endTime": end,
-    })
-
-    categories = {}
+    The categories synced on their own (code, design) are picked out in the
+    same pass, so callers don't need a second lookup.
+    """
+    breakdown = {}
     total_time = 0
     focus_time = 0
+    coding_time = 0
+    design_time = 0
 
-    for cat in data["categories"]:
+    for cat in categories:
         key = cat["category"]["key"]
         time_spent = cat["timeSpent"]
         is_focus = cat["category"]["focus"]
 
-        categories[key] = time_spent
+        breakdown[key] = time_spent
         total_time += time_spent
         if is_focus:
             focus_time += time_spent
+        if key == "code":
+            coding_time = time_spent
+        elif key == "design":
+            design_time = time_spent
 
     return {
-        "categories": categories,
+        "categories": breakdown,
         "total_time": total_time,
         "focus_time": focus_time,
+        "coding_time": coding_time,
+        "design_time": design_time,
     }
 
 
-def get_session_counts(api_key: str, target_date: date) -> dict:
+def _summarize_sessions(sessions: list, now: datetime) -> dict:
     """
-    Count completed/started sessions by type for a specific date.
+    Count started sessions by type and sum elapsed meeting time in one pass.
 
-    Only counts sessions that have actually started (startTime <= now).
-
-    Args:
-        api_key: Rize API key
-        target_date: The date to fetch data for
-
-    Returns:
-        dict with counts: focus_sessions, break_sessions, meeting_sessions
-    """
-    start = datetime.combine(target_date, datetime.min.time()).isoformat() + "Z"
-    end = datetime.combine(target_date, datetime.max.time()).isoformat() + "Z"
-
-    query = """
-    query Sessions($startTime: ISO8601DateTime!, $endTime: ISO8601DateTime!) {
-        sessions(startTime: $startTime, endTime: $endTime) {
-            type
-            startTime
-        }
-    }
+    Sessions that haven't started yet (startTime > now) are ignored, and
+    ongoing meetings are only counted up to now.
     """
-
-    data = _make_request(api_key, query, {
-        "startTime": start,
-        "endTime": end,
-    })
-
-    now = datetime.now(timezone.utc)
     counts = {"focus": 0, "break": 0, "meeting": 0}
+    meeting_seconds = 0
 
-    for session in data["sessions"]:
-        # Parse session start time and check if it's in the past
-        start_str = session["startTime"]
-        # Handle both formats: with and without timezone
-        try:
-            if "+" in start_str or start_str.endswith("Z"):
-                session_start = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
-            else:
-                # Assume UTC if no timezone
-                session_start = datetime.fromisoformat(start_str).replace(tzinfo=timezone.utc)
-        except ValueError:
+    for session in sessions:
+        session_start = _parse_iso(session.get("startTime"))
+        # Only count sessions that have started
+        if session_start is None or session_start > now:
             continue
 
-        # Only count sessions that have started
-        if session_start <= now:
-            session_type = session["type"]
-            if session_type in counts:
-                counts[session_type] += 1
+        session_type = session["type"]
+        if session_type in counts:
+            counts[session_type] += 1
+
+        if session_type == "meeting":
+            session_end = _parse_iso(session.get("endTime"))
+            if session_end is None:
+                continue
+            # Cap end time at now if meeting is ongoing
+            effective_end = min(session_end, now)
+            duration = (effective_end - session_start).total_seconds()
+            if duration > 0:
+                meeting_seconds += int(duration)
 
     return {
         "focus_sessions": counts["focus"],
         "break_sessions": counts["break"],
         "meeting_sessions": counts["meeting"],
+        "meeting_time": meeting_seconds,
     }
 
 
-def get_meeting_time(api_key: str, target_date: date) -> int:
-    """
-    Get actual meeting time from completed meeting sessions.
-
-    Args:
-        api_key: Rize API key
-        target_date: The date to fetch data for
-
-    Returns:
-        Meeting time in seconds
-    """
-    start = datetime.combine(target_date, datetime.min.time()).isoformat() + "Z"
-    end = datetime.combine(target_date, datetime.max.time()).isoformat() + "Z"
-
-    query = """
-    query Sessions($startTime: ISO8601DateTime!, $endTime: ISO8601DateTime!) {
-        sessions(startTime: $startTime, endTime: $endTime) {
-            type
-            startTime
-            endTime
-        }
-    }
-    """
-
-    data = _make_request(api_key, query, {
-        "startTime": start,
-        "endTime": end,
-    })
-
-    now = datetime.now(timezone.utc)
-    meeting_seconds = 0
-
-    for session in data["sessions"]:
-        if session["type"] != "meeting":
-            continue
-
-        try:
-            start_str = session["startTime"]
-            end_str = session["endTime"]
-
-            if "+" in start_str or start_str.endswith("Z"):
-                session_start = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
-            else:
-                session_start = datetime.fromisoformat(start_str).replace(tzinfo=timezone.utc)
-
-            if "+" in end_str or end_str.endswith("Z"):
-                session_end = datetime.fromisoformat(end_str.replace("Z", "+00:00"))
-            else:
-                session_end = datetime.fromisoformat(end_str).replace(tzinfo=timezone.utc)
-
-            # Only count if session has started
-            if session_start <= now:
-                # Cap end time at now if meeting is ongoing
-                effective_end = min(session_end, now)
-                duration = (effective_end - session_start).total_seconds()
-                if duration > 0:
-                    meeting_seconds += int(duration)
-        except (ValueError, KeyError):
-            continue
-
-    return meeting_seconds
-
-
 def get_all_daily_data(api_key: str, target_date: date) -> dict:
     """
     Fetch all available metrics for a specific date.
 
     Uses category breakdown for accurate tracked/focus time,
-    and filters sessions to only count completed ones.
+    and filters sessions to only count completed ones. Categories
+    and sessions are requested in a single GraphQL query.
 
     Args:
         api_key: Rize API key
@@ -215,21 +170,20 @@ def get_all_daily_data(api_key: str, target_date: date) -> dict:
     Returns:
         dict with all metrics
     """
-    category_data = get_category_breakdown(api_key, target_date)
-    sessions = get_session_counts(api_key, target_date)
-    meeting_time = get_meeting_time(api_key, target_date)
+    data = _make_request(api_key, _Q_ALL, _day_range(target_date))
 
-    categories = category_data["categories"]
+    category_data = _summarize_categories(data["categories"])
+    sessions = _summarize_sessions(data["sessions"], datetime.now(timezone.utc))
 
     return {
         # Computed from categories (actual tracked activity, in seconds)
         "focus_time": category_data["focus_time"],
         "tracked_time": category_data["total_time"],
         # Specific categories (in seconds)
-        "coding_time": categories.get("code", 0),
-        "design_time": categories.get("design", 0),
+        "coding_time": category_data["coding_time"],
+        "design_time": category_data["design_time"],
         # From sessions (actual meeting time)
-        "meeting_time": meeting_time,
+        "meeting_time": sessions["meeting_time"],
         # Break time = tracked time - focus time (time in non-focus categories)
         "break_time": category_data["total_time"] - category_data["focus_time"],
         # Session counts (only started sessions)
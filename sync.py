@@ -7,67 +7,86 @@ as custom attributes.
 
 Usage:
     python sync.py           # Sync today's data
+    python sync.py --backfill-days 7  # Also sync the previous 7 days
     python sync.py --setup   # First-time setup (create attributes)
     python sync.py --migrate # Migrate from old rize_* attributes to new names
+    python sync.py --force   # Re-send values even if Exist already has them
+    python sync.py --force-refresh  # Re-fetch Rize data instead of using the cache
+    python sync.py --quiet   # Only report warnings and errors (--verbose for debug output)
 """
 import argparse
+import hashlib
+import logging
 import os
+import re
 import sys
-from datetime import date, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
 
 from dotenv import load_dotenv
 
-from rize_client import get_all_daily_data
+import cache
+from rize_client import MAX_CONCURRENT_REQUESTS, get_all_daily_data
 from exist_client import ExistClient
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AttrSpec:
+    """An Exist attribute written by this script and where its value comes from."""
+    name: str  # Exist attribute slug, also the key in the Rize data
+    label: str
+    short_label: str  # Shown in the per-day Rize data summary
+    value_type: str  # Key into exist_client.VALUE_TYPES
+    group: str
+
+    @property
+    def is_duration(self) -> bool:
+        """Rize reports durations in seconds; Exist stores them in minutes."""
+        return self.value_type == "duration"
+
 
 # Attribute configuration - clean names without service prefix
-ATTRIBUTES = {
+ATTRIBUTES = (
     # Duration attributes (value in minutes)
-    "focus_time": {
-        "label": "Focus time",
-        "value_type": "duration",
-        "group": "productivity",
-    },
-    "tracked_time": {
-        "label": "Tracked time",
-        "value_type": "duration",
-        "group": "productivity",
-    },
-    "break_time": {
-        "label": "Break time",
-        "value_type": "duration",
-        "group": "productivity",
-    },
-    "meeting_time": {
-        "label": "Meeting time",
-        "value_type": "duration",
-        "group": "productivity",
-    },
-    "coding_time": {
-        "label": "Coding time",
-        "value_type": "duration",
-        "group": "productivity",
-    },
-    "design_time": {
-        "label": "Design time",
-        "value_type": "duration",
-        "group": "productivity",
-    },
+    AttrSpec("focus_time", "Focus time", "focus", "duration", "productivity"),
+    AttrSpec("tracked_time", "Tracked time", "tracked", "duration", "productivity"),
+    AttrSpec("break_time", "Break time", "break", "duration", "productivity"),
+    AttrSpec("meeting_time", "Meeting time", "meeting", "duration", "productivity"),
+    AttrSpec("coding_time", "Coding time", "coding", "duration", "productivity"),
+    AttrSpec("design_time", "Design time", "design", "duration", "productivity"),
     # Count attributes (integer value)
-    "focus_sessions": {
-        "label": "Focus sessions",
-        "value_type": "integer",
-        "group": "productivity",
-    },
-}
+    AttrSpec("focus_sessions", "Focus sessions", "focus_sessions", "integer", "productivity"),
+)
+
+# Slugs of the attributes above, in the same order
+ATTRIBUTE_NAMES = tuple(spec.name for spec in ATTRIBUTES)
 
 # Old attributes to migrate from
 OLD_ATTRIBUTES = ["rize_focus_time", "rize_tracked_time"]
 
+# How long the set of owned Exist attributes is cached on disk (seconds)
+OWNED_CACHE_TTL = 3600
+OWNED_CACHE_NAME = "exist-owned"
 
+# Cache entries that belong to a single day: Rize data and synced snapshots
+_DATED_CACHE_ENTRY = re.compile(r"^(?:rize|synced)-.*?(\d{4}-\d{2}-\d{2})")
+
+# How long after a day ends (in UTC, as Rize is queried) before its Rize
+# data is considered final and cached on disk
+SETTLE_TIME = timedelta(hours=6)
+
+
+@lru_cache(maxsize=1)
 def load_config() -> dict:
-    """Load configuration from .env file."""
+    """
+    Load configuration from .env file.
+
+    The result is memoized, so .env is parsed only once per process.
+    """
     load_dotenv()
 
     required = [
@@ -80,21 +99,13 @@ def load_config() -> dict:
         "EXIST_CLIENT_SECRET",
     ]
 
-    config = {}
-    missing = []
-
-    for key in required:
-        value = os.getenv(key)
-        if not value:
-            missing.append(key)
-        config[key] = value
-
-    for key in optional:
-        config[key] = os.getenv(key)
+    env = os.environ
+    config = {key: env.get(key) for key in (*required, *optional)}
+    missing = [key for key in required if not config[key]]
 
     if missing:
-        print(f"Error: Missing required environment variables: {', '.join(missing)}")
-        print("Please check your .env file")
+        logger.error("Missing required environment variables: %s", ", ".join(missing))
+        logger.error("Please check your .env file")
         sys.exit(1)
 
     return config
@@ -110,119 +121,384 @@ def get_exist_client(config: dict) -> ExistClient:
     )
 
 
+def _key_hash(secret: str) -> str:
+    """Short, non-reversible tag for a credential, used in cache entry names."""
+    return hashlib.sha256(secret.encode()).hexdigest()[:12]
+
+
+def _exist_cache_name(exist: ExistClient, name: str) -> str:
+    """
+    Name a cache entry describing what an Exist account holds.
+
+    The entry is tied to the client's access token, so pointing .env at a
+    different account never reuses another account's entries. A token
+    refresh starts them over too, which costs one extra lookup.
+    """
+    return f"{name}-{_key_hash(exist.access_token)}"
+
+
+def get_owned_names(exist: ExistClient) -> frozenset:
+    """
+    Get the names of the attributes this client owns.
+
+    The set is cached on disk for OWNED_CACHE_TTL, so most runs don't need
+    to ask Exist at all. --setup and --migrate clear it.
+    """
+    now = datetime.now(timezone.utc).timestamp()
+    cache_name = _exist_cache_name(exist, OWNED_CACHE_NAME)
+    cached = cache.load(cache_name)
+    if cached is not None and now - cached.get("fetched_at", 0) < OWNED_CACHE_TTL:
+        return frozenset(cached["names"])
+
+    names = frozenset(attr["name"] for attr in exist.get_owned_attributes())
+    cache.store(cache_name, {"fetched_at": now, "names": sorted(names)})
+    return names
+
+
 def migrate_attributes(exist: ExistClient):
     """Release old rize_* attributes."""
-    print("Migrating from old attribute names...")
+    logger.info("Migrating from old attribute names...")
+    cache.remove(_exist_cache_name(exist, OWNED_CACHE_NAME))
 
-    for attr_name in OLD_ATTRIBUTES:
-        try:
-            exist.release_attribute(attr_name)
-            print(f"  Released: {attr_name}")
-        except Exception as e:
-            print(f"  Could not release {attr_name}: {e}")
+    try:
+        result = exist.release_attributes(OLD_ATTRIBUTES)
+        for released in result.get("success", []):
+            logger.info("  Released: %s", released["name"])
+        for failed in result.get("failed", []):
+            logger.warning("  Could not release %s: %s", failed["name"], failed.get("error"))
+    except Exception as e:
+        logger.warning("  Could not release %s: %s", ", ".join(OLD_ATTRIBUTES), e)
 
-    print("Migration complete. Now run --setup to create new attributes.")
+    logger.info("Migration complete. Now run --setup to create new attributes.")
 
 
 def setup_attributes(exist: ExistClient):
     """Create and acquire the custom attributes in Exist."""
-    print("Setting up Exist attributes...")
+    logger.info("Setting up Exist attributes...")
+    cache.remove(_exist_cache_name(exist, OWNED_CACHE_NAME))
 
     # Check what attributes we already own
     try:
-        owned = exist.get_owned_attributes()
-        owned_names = {attr["attribute"] for attr in owned}
+        owned_names = get_owned_names(exist)
     except Exception as e:
-        print(f"Warning: Could not fetch owned attributes: {e}")
-        owned_names = set()
+        logger.warning("Could not fetch owned attributes: %s", e)
+        owned_names = frozenset()
 
-    for attr_name, attr_config in ATTRIBUTES.items():
-        if attr_name in owned_names:
-            print(f"  Already own: {attr_name}")
-            continue
+    missing = []
+    for spec in ATTRIBUTES:
+        if spec.name in owned_names:
+            logger.info("  Already own: %s", spec.name)
+        else:
+            missing.append(spec)
 
-        # Try to create the attribute
+    if missing:
+        # Create all missing attributes in one request. Creating one that
+        # already exists fails harmlessly; it's acquired below either way.
         try:
-            result = exist.create_attribute(
-                label=attr_config["label"],
-                value_type=attr_config["value_type"],
-                group=attr_config["group"],
-            )
-            print(f"  Created: {attr_name}")
-
-            if isinstance(result, list) and result:
-                created = result[0]
-                if "name" in created:
-                    print(f"    -> {created['name']}")
-                if "error" in created:
-                    print(f"    -> Error: {created['error']}")
-
+            result = exist.create_attributes([
+                (spec.label, spec.value_type, spec.group) for spec in missing
+            ])
+            for created in result.get("success", []):
+                logger.info("  Created: %s", created.get("name", created.get("label")))
+            for failed in result.get("failed", []):
+                logger.warning("  Could not create %s: %s",
+                               failed.get("label"), failed.get("error"))
         except Exception as e:
-            print(f"  Could not create {attr_name}: {e}")
+            logger.warning("  Could not create attributes: %s", e)
 
-        # Try to acquire ownership
+        # Then acquire ownership of all of them in one request
         try:
-            result = exist.acquire_attribute(attr_name)
-            print(f"  Acquired: {attr_name}")
+            result = exist.acquire_attributes([spec.name for spec in missing])
+            for acquired in result.get("success", []):
+                logger.info("  Acquired: %s", acquired["name"])
+            for failed in result.get("failed", []):
+                logger.warning("  Could not acquire %s: %s", failed["name"], failed.get("error"))
         except Exception as e:
-            print(f"  Could not acquire {attr_name}: {e}")
+            logger.warning("  Could not acquire attributes: %s", e)
+
+    # Ownership just changed, so don't keep the listing fetched above
+    cache.remove(_exist_cache_name(exist, OWNED_CACHE_NAME))
+    logger.info("Setup complete!")
+
+
+def fetch_rize_data(api_key: str, target_date: date, force_refresh: bool = False) -> dict:
+    """
+    Get Rize data for a date, reusing the on-disk cache for settled days.
+
+    A day's data only stops changing once it's over, so it is cached only
+    when the day ended more than SETTLE_TIME ago. `force_refresh` skips
+    the cached copy and fetches again, as does a cached copy missing any
+    of the synced attributes.
+    """
+    cache_name = f"rize-{_key_hash(api_key)}-{target_date.isoformat()}"
+
+    if not force_refresh:
+        cached = cache.load(cache_name)
+        # Entries cached before an attribute was added lack its value
+        if isinstance(cached, dict) and all(name in cached for name in ATTRIBUTE_NAMES):
+            logger.debug("Using cached Rize data for %s", target_date)
+            return cached
+
+    rize_data = get_all_daily_data(api_key, target_date)
+
+    day_end = datetime.combine(target_date, time.max, tzinfo=timezone.utc)
+    if datetime.now(timezone.utc) - day_end > SETTLE_TIME:
+        cache.store(cache_name, rize_data)
+
+    return rize_data
+
+
+def prefetch_rize_data(api_key: str, dates: list, force_refresh: bool = False) -> dict:
+    """
+    Start fetching Rize data for several dates concurrently.
 
-    print("Setup complete!")
+    Returns:
+        dict mapping each date to a Future resolving to its Rize data
+    """
+    executor = ThreadPoolExecutor(max_workers=min(len(dates), MAX_CONCURRENT_REQUESTS))
+    pending = {d: executor.submit(fetch_rize_data, api_key, d, force_refresh)
+               for d in dates}
+    executor.shutdown(wait=False)
+    return pending
 
 
-def sync_data(config: dict, target_date: date = None):
-    """Sync Rize data to Exist for the given date."""
-    if target_date is None:
-        target_date = date.today()
+def load_synced_values(exist: ExistClient, target_date: date):
+    """
+    Get the values this machine last synced to the client's Exist account
+    for a date.
 
-    print(f"Syncing data for {target_date.isoformat()}...")
+    Changes made in Exist itself aren't reflected here; --force sends
+    everything again.
+
+    Returns:
+        dict mapping attribute name to value, or None if the date has no
+        snapshot yet
+    """
+    return cache.load(_exist_cache_name(exist, f"synced-{target_date.isoformat()}"))
+
+
+def save_synced_values(exist: ExistClient, target_date: date, values: dict):
+    """Record the values Exist now holds for a date, for the next run."""
+    cache.store(_exist_cache_name(exist, f"synced-{target_date.isoformat()}"), values)
+
+
+def prune_cache(before: date):
+    """
+    Drop cached Rize data and synced snapshots for days before `before`.
+
+    Runs only look back over their backfill window, so older entries would
+    never be read again and would just pile up.
+    """
+    for name in cache.names():
+        match = _DATED_CACHE_ENTRY.match(name)
+        if match and date.fromisoformat(match.group(1)) < before:
+            cache.remove(name)
+
+
+def _in_background(fn, *args, **kwargs) -> Future:
+    """Run fn(*args, **kwargs) on its own thread and return its Future."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(fn, *args, **kwargs)
+    executor.shutdown(wait=False)
+    return future
+
+
+def prefetch_stored_values(exist: ExistClient, dates: list) -> Future:
+    """
+    Start looking up the values Exist already has for the given dates.
+
+    All dates are covered by one lookup, which runs in the background
+    alongside the Rize queries.
+
+    Returns:
+        Future resolving to the dict from ExistClient.get_attribute_values()
+    """
+    return _in_background(
+        exist.get_attribute_values,
+        list(ATTRIBUTE_NAMES),
+        max(dates),
+        days=(max(dates) - min(dates)).days + 1,
+    )
+
+
+def collect_updates(exist: ExistClient, target_date: date, pending: Future, stored,
+                    owned_names, force: bool):
+    """
+    Read a date's Rize data and work out which Exist updates it needs.
+
+    Args:
+        exist: Exist client, for the snapshot of the last sync
+        target_date: The date to collect
+        pending: Future from prefetch_rize_data() for the date
+        stored: Future from prefetch_stored_values() covering every date
+            without a snapshot, or None if there are none (or with `force`)
+        owned_names: Attribute names this client owns, or None if unknown;
+            others are left out, since Exist would reject them
+        force: Keep values even if Exist already has them
+
+    Values that already match what Exist has are skipped unless `force` is
+    set. What Exist has is taken from the snapshot of the last sync of this
+    date (see load_synced_values()) when there is one, and from `stored`
+    otherwise.
+
+    Returns:
+        (metrics, updates, not_owned) where `updates` is a list of
+        (name, date, value) tuples to send, or None if Rize couldn't be read
+    """
+    logger.info("Syncing data for %s...", target_date)
 
     # Fetch from Rize
-    print("  Fetching from Rize...")
+    logger.info("  Fetching from Rize...")
     try:
-        rize_data = get_all_daily_data(config["RIZE_API_KEY"], target_date)
+        rize_data = pending.result()
+
+        # Convert seconds to minutes for duration attributes; counts pass through
+        metrics = {
+            spec.name: rize_data[spec.name] // 60 if spec.is_duration else rize_data[spec.name]
+            for spec in ATTRIBUTES
+        }
     except Exception as e:
-        print(f"  Error fetching Rize data: {e}")
-        return False
-
-    # Convert seconds to minutes for duration attributes
-    metrics = {
-        "focus_time": rize_data["focus_time"] // 60,
-        "tracked_time": rize_data["tracked_time"] // 60,
-        "break_time": rize_data["break_time"] // 60,
-        "meeting_time": rize_data["meeting_time"] // 60,
-        "coding_time": rize_data["coding_time"] // 60,
-        "design_time": rize_data["design_time"] // 60,
-        "focus_sessions": rize_data["focus_sessions"],  # count, not duration
-    }
-
-    print(f"  Rize data:")
-    print(f"    focus={metrics['focus_time']}min, tracked={metrics['tracked_time']}min")
-    print(f"    break={metrics['break_time']}min, meeting={metrics['meeting_time']}min")
-    print(f"    coding={metrics['coding_time']}min, design={metrics['design_time']}min")
-    print(f"    focus_sessions={metrics['focus_sessions']}")
-
-    # Update Exist
-    exist = get_exist_client(config)
-
-    print("  Updating Exist...")
-    success_count = 0
-    fail_count = 0
-
-    for attr_name, value in metrics.items():
+        logger.error("  Could not fetch Rize data: %s", e)
+        return None
+
+    # Two values per line, e.g. "focus=143min, tracked=171min". Only built
+    # when it will be shown, i.e. not under --quiet.
+    if logger.isEnabledFor(logging.INFO):
+        fields = [
+            f"{spec.short_label}={metrics[spec.name]}min"
+            if spec.is_duration else f"{spec.short_label}={metrics[spec.name]}"
+            for spec in ATTRIBUTES
+        ]
+        logger.info("  Rize data:")
+        for i in range(0, len(fields), 2):
+            logger.info("    %s", ", ".join(fields[i:i + 2]))
+
+    not_owned = []
+    if owned_names is not None:
+        not_owned = [name for name in metrics if name not in owned_names]
+
+    updates = [(attr_name, target_date, value) for attr_name, value in metrics.items()
+               if attr_name not in not_owned]
+
+    if not force:
+        previous = load_synced_values(exist, target_date)
         try:
-            result = exist.update_attribute(attr_name, target_date, value)
-            if result.get("success"):
-                success_count += 1
-            elif result.get("failed"):
-                fail_count += 1
-                print(f"    {attr_name}: FAILED - {result['failed']}")
+            if previous is not None:
+                current = {(name, target_date): value for name, value in previous.items()}
+            else:
+                current = stored.result()
         except Exception as e:
-            fail_count += 1
-            print(f"    {attr_name}: ERROR - {e}")
+            logger.warning("  Could not fetch current values: %s", e)
+            current = {}
+
+        updates = [(name, day, value) for name, day, value in updates
+                   if current.get((name, day)) != value]
+
+    logger.info("  %d changed, %d unchanged",
+                len(updates), len(metrics) - len(updates) - len(not_owned))
+    return metrics, updates, not_owned
+
+
+def sync_data(exist: ExistClient, rize_key: str, plan: list,
+              force: bool = False, force_refresh: bool = False) -> bool:
+    """
+    Sync Rize data to Exist for several dates.
+
+    Rize data for all dates is fetched concurrently, and the updates for
+    every date go to Exist together as one batch.
+
+    Args:
+        exist: Exist client to update
+        rize_key: Rize API key
+        plan: (heading, date) pairs to sync, oldest first; heading may be None
+        force: Send every value, even ones Exist already has
+        force_refresh: Ignore cached Rize data
+
+    Returns:
+        True if every value was read and synced
+    """
+    dates = [target_date for _, target_date in plan]
+
+    # The Rize queries and the lookups of Exist's owned attributes and
+    # stored values are independent, so start them all at once. Stored
+    # values are only needed for dates this machine has no snapshot of from
+    # an earlier sync, e.g. on the first run.
+    pending = prefetch_rize_data(rize_key, dates, force_refresh)
+    owned = _in_background(get_owned_names, exist)
+    unsynced = [d for d in dates if load_synced_values(exist, d) is None]
+    stored = None
+    if unsynced and not force:
+        stored = prefetch_stored_values(exist, unsynced)
 
-    print(f"  Done: {success_count} updated, {fail_count} failed")
-    return fail_count == 0
+    try:
+        # Needed by every day, so resolve it once. If it can't be fetched, all
+        # values are sent and Exist reports any it rejects.
+        try:
+            owned_names = owned.result()
+        except Exception as e:
+            logger.warning("Could not fetch owned attributes: %s", e)
+            owned_names = None
+        else:
+            not_owned = [name for name in ATTRIBUTE_NAMES if name not in owned_names]
+            if not_owned:
+                logger.warning("Not owned (run --setup): %s", ", ".join(not_owned))
+
+        unread = []
+        collected = {}
+        for i, (heading, target_date) in enumerate(plan):
+            if i:
+                logger.info("")
+            if heading:
+                logger.info("=== %s ===", heading)
+            day = collect_updates(exist, target_date, pending[target_date], stored,
+                                  owned_names, force)
+            if day is None:
+                unread.append(target_date)
+            else:
+                collected[target_date] = day
+    finally:
+        # If every Rize fetch failed, nothing has waited for the Exist
+        # lookups yet; don't leave them running once the client is closed
+        wait([future for future in (owned, stored) if future is not None])
+
+    updates = [update for _, day_updates, _ in collected.values() for update in day_updates]
+    not_owned_count = sum(len(not_owned) for _, _, not_owned in collected.values())
+    unchanged_count = sum(len(metrics) for metrics, _, _ in collected.values()) \
+        - len(updates) - not_owned_count
+
+    logger.info("")
+    logger.info("Updating Exist...")
+    result = {"success": [], "failed": []}
+    if updates:
+        result = exist.update_attributes(updates)
+    for failed in result["failed"]:
+        logger.error("  %s %s: FAILED - %s",
+                     failed.get("date"), failed["name"], failed.get("error"))
+
+    # Record what Exist now holds, including values that were already
+    # there. Anything that didn't make it is left out, so the next run
+    # sends it again.
+    failed_keys = {(failed["name"], failed.get("date")) for failed in result["failed"]}
+    for target_date, (metrics, _, not_owned) in collected.items():
+        save_synced_values(exist, target_date, {
+            name: value for name, value in metrics.items()
+            if name not in not_owned and (name, target_date.isoformat()) not in failed_keys
+        })
+
+    prune_cache(min(dates))
+
+    if unread:
+        logger.error("  Skipped, Rize data unavailable: %s",
+                     ", ".join(d.isoformat() for d in unread))
+
+    success_count = len(result["success"])
+    fail_count = len(result["failed"]) + not_owned_count
+    if not updates and not fail_count and not unread:
+        logger.info("  Done: no changes (%d unchanged, --force re-sends them)", unchanged_count)
+    else:
+        logger.info("  Done: %d updated, %d failed, %d unchanged",
+                    success_count, fail_count, unchanged_count)
+    return not unread and fail_count == 0
 
 
 def main():
@@ -241,43 +517,87 @@ def main():
     )
     parser.add_argument(
         "--date",
-        type=str,
+        type=date.fromisoformat,
         help="Sync a specific date (YYYY-MM-DD format)",
     )
     parser.add_argument(
         "--no-backfill",
         action="store_true",
-        help="Skip syncing yesterday's data",
+        help="Skip syncing previous days (same as --backfill-days 0)",
+    )
+    parser.add_argument(
+        "--backfill-days",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Also sync the N days before today (default: 1, i.e. yesterday)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Send every value, even if Exist already has it",
+    )
+    parser.add_argument(
+        "--force-refresh",
+        action="store_true",
+        help="Ignore cached Rize data and fetch it again",
+    )
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Only report warnings and errors",
+    )
+    verbosity.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Also show debug output, including HTTP connections",
     )
     args = parser.parse_args()
 
+    # Plain messages on stdout, like the prints they replace; the level
+    # only decides what is shown
+    if args.quiet:
+        level = logging.WARNING
+    elif args.verbose:
+        level = logging.DEBUG
+    else:
+        level = logging.INFO
+    logging.basicConfig(level=level, format="%(message)s", stream=sys.stdout)
+
+    if args.backfill_days < 0:
+        parser.error("--backfill-days must not be negative")
+    if args.no_backfill:
+        args.backfill_days = 0
+
     config = load_config()
-    exist = get_exist_client(config)
 
-    if args.migrate:
-        migrate_attributes(exist)
-    elif args.setup:
-        setup_attributes(exist)
-    else:
-        if args.date:
-            # Specific date requested - just sync that date
-            target_date = date.fromisoformat(args.date)
-            success = sync_data(config, target_date)
+    with get_exist_client(config) as exist:
+        if args.migrate:
+            migrate_attributes(exist)
+        elif args.setup:
+            setup_attributes(exist)
         else:
-            # Default: sync today and yesterday (backfill)
             today = date.today()
-            yesterday = today - timedelta(days=1)
-
-            success = True
-            if not args.no_backfill:
-                print("=== Backfilling yesterday ===")
-                success = sync_data(config, yesterday) and success
-                print()
-
-            print("=== Syncing today ===")
-            success = sync_data(config, today) and success
 
-        sys.exit(0 if success else 1)
+            # (heading, date) pairs to sync, oldest first
+            if args.date:
+                # Specific date requested - just sync that date
+                plan = [(None, args.date)]
+            else:
+                # Default: sync today plus the previous days (backfill)
+                plan = []
+                for days_ago in range(args.backfill_days, 0, -1):
+                    if days_ago == 1:
+                        plan.append(("Backfilling yesterday", today - timedelta(days=1)))
+                    else:
+                        backfill_date = today - timedelta(days=days_ago)
+                        plan.append((f"Backfilling {backfill_date.isoformat()}", backfill_date))
+                plan.append(("Syncing today", today))
+
+            success = sync_data(exist, config["RIZE_API_KEY"], plan,
+                                force=args.force, force_refresh=args.force_refresh)
+            sys.exit(0 if success else 1)
 
 
 if __name__ == "__main__":